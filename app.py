@@ -8,63 +8,96 @@ Routes
 GET  /              Chat interface (HTML)
 GET  /feed          Browse all saved news items (HTML)
 GET  /api/new-session   Create a session and get an initial greeting
-POST /api/chat          Send a message, get a response
+POST /api/chat          Send a message, get a response (JSON, or SSE with "stream": true)
 GET  /api/feed          JSON list of all saved items
 
 Session management
 ------------------
-Conversation histories are stored in-memory in a plain dict keyed by a UUID
-session ID. The session ID lives in the browser's localStorage and is sent
-with every chat request. This is deliberately simple — sessions are lost on
-server restart, which is fine for a private tool.
+Conversation histories are stored in-memory in an OrderedDict keyed by a UUID
+session ID, kept in least-recently-used order so that the idlest sessions are
+dropped first once MAX_SESSIONS is reached. The session ID lives in the
+browser's localStorage and is sent with every chat request. This is
+deliberately simple — sessions are lost on server restart, which is fine for
+a private tool.
 
 Tag parsing
 -----------
 When the LLM has collected and the user has agreed on a news item, the model
 embeds a <SAVE_ITEM>...</SAVE_ITEM> block in its response. This module:
-  1. Detects that block with a regex
+  1. Detects that block (or an <UPDATE_ITEM> block) with a single regex
   2. Extracts the four fields (name, url, reason, agreed_text)
-  3. Saves them to SQLite
+  3. Saves them to SQLite (or updates the existing item)
   4. Strips the raw XML from the displayed response
   5. Returns the saved item metadata to the frontend for a confirmation flash
 
 Feed injection
 --------------
 If the user's message looks like a request to see the feed, the current items
-are fetched from SQLite and injected into the conversation as a system-style
-assistant message before the LLM is called. The LLM can then summarise the
-feed naturally in its reply.
+are fetched from SQLite and passed to the LLM as per-turn context, sent after
+the conversation history (see llm.py on keeping the system prompt first and
+constant). The LLM can then summarise the feed naturally in its reply; the
+feed data itself is not kept in the session history.
 """
 
-import json
+import logging
 import re
 import time
 import uuid
 import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from itertools import chain
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
 from config import settings
-from db import delete_news_item, get_feed, get_item_count, get_items_by_name, init_db, mark_done, save_news_item, update_news_item
-from llm import chat as llm_chat
+from db import delete_news_item, get_feed_cached, get_item_count, get_items_by_name, init_db, mark_done, save_news_item, update_news_item
+from intents import HOWTO_REPLY, detect_intent
+from llm import achat as llm_achat
+from llm import achat_stream as llm_achat_stream
+from llm import SYSTEM_PROMPT_SHA256, HistorySummary, acompress_history, extract_action, needs_llm
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # App setup
 # ---------------------------------------------------------------------------
 
-app = FastAPI(title=settings.app_title)
+class ORJSONResponse(Response):
+    """JSON response serialised with orjson (C, much faster than stdlib json)."""
+
+    media_type = "application/json"
+
+    def render(self, content: object) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(title=settings.app_title, default_response_class=ORJSONResponse)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
 # In-memory session store: { session_id: [{"role": ..., "content": ...}, ...] }
-sessions: dict[str, list[dict]] = {}
+# Kept in least-recently-used order so pruning drops idle sessions first.
+sessions: OrderedDict[str, list[dict]] = OrderedDict()
+
+# Rolling summaries of older history, per session (see llm.compress_history).
+# Only populated when settings.history_keep_last is set.
+summaries: dict[str, HistorySummary] = {}
 
-MAX_SESSIONS = 500          # prune oldest when exceeded
+# Double-submit detection, per session: the last turn answered and when it
+# finished, and the turn currently being answered and when it started.
+#   { session_id: (message, monotonic_ns) }
+_last_turns: dict[str, tuple[str, int]] = {}
+_pending_turns: dict[str, tuple[str, int]] = {}
+_DUPLICATE_WINDOW_NS = 2_000_000_000   # a resend within 2 s is a double-submit
+
+MAX_SESSIONS = 500          # prune least recently used when exceeded
 MAX_HISTORY = 60            # messages per session before trimming
 
 # Keywords that trigger feed injection into the LLM context
@@ -80,29 +113,57 @@ UPDATE_KEYWORDS = (
     "i made a mistake", "wrong", "update my", "edit my", "change my",
 )
 
+# ---------------------------------------------------------------------------
+# Precompiled patterns (compiled once at import, not per request)
+# ---------------------------------------------------------------------------
+
+# One alternation per keyword list, so detection is a single pass over the message
+_FEED_KEYWORDS_RE   = re.compile("|".join(map(re.escape, FEED_KEYWORDS)), re.IGNORECASE)
+_UPDATE_KEYWORDS_RE = re.compile("|".join(map(re.escape, UPDATE_KEYWORDS)), re.IGNORECASE)
+
+# Closing tag of an action block, used while streaming
+_ACTION_CLOSE_RE = re.compile(r"</(?:SAVE|UPDATE)_ITEM>", re.IGNORECASE)
+
+# "Hi Sam", "Thanks, Sam" etc. — used to recover the contributor's name
+_GREETING_RE = re.compile(
+    r"(?:hi|hello|thanks|thank you|great|perfect|sure|ok|okay)[,!]?\s+([A-Z][a-z]+)",
+    re.IGNORECASE,
+)
+
+# Em/en dashes, with any surrounding whitespace, and the numeric-range
+# exception ("2–4") that _strip_dashes turns into a hyphen instead
+_DASH_RE = re.compile(r"\s*[—–]\s*")
+_NUMERIC_RANGE_DASH_RE = re.compile(r"(?<=\d)[—–](?=\d)")
+_DOUBLE_COMMA_RE = re.compile(r",\s*,")
+
 # ---------------------------------------------------------------------------
 # Rate limiting (in-memory, no extra dependencies)
 # ---------------------------------------------------------------------------
 
-_rate_limit: dict[str, list] = {}   # { ip: [count, window_start] }
-_RL_MAX    = 20     # max requests per window
-_RL_WINDOW = 60.0   # window length in seconds
+_rate_limit: OrderedDict[str, tuple[int, int]] = OrderedDict()   # { ip: (count, window_start_ns) }, LRU order
+_RL_MAX       = 20                  # max requests per window
+_RL_WINDOW_NS = 60_000_000_000      # window length in nanoseconds (60 s)
+_RL_MAX_IPS   = 10_000              # tracked IPs before the least recently seen is evicted
 
 
 def _check_rate_limit(ip: str) -> bool:
     """Return True if the request is within the allowed rate, False if over limit."""
-    now = time.monotonic()
-    if ip not in _rate_limit:
-        _rate_limit[ip] = [1, now]
+    now = time.monotonic_ns()
+    entry = _rate_limit.get(ip)
+    if entry is None:
+        _rate_limit[ip] = (1, now)
+        if len(_rate_limit) > _RL_MAX_IPS:
+            _rate_limit.popitem(last=False)
         return True
-    count, start = _rate_limit[ip]
-    if now - start > _RL_WINDOW:
+    _rate_limit.move_to_end(ip)
+    count, start = entry
+    if now - start > _RL_WINDOW_NS:
         # Window has expired — start a fresh one
-        _rate_limit[ip] = [1, now]
+        _rate_limit[ip] = (1, now)
         return True
     if count >= _RL_MAX:
         return False
-    _rate_limit[ip][0] += 1
+    _rate_limit[ip] = (count + 1, start)
     return True
 
 
@@ -112,44 +173,136 @@ def _check_rate_limit(ip: str) -> bool:
 
 def _get_or_create_session(session_id: str) -> list[dict]:
     """Return the history list for a session, creating it if needed."""
-    if session_id not in sessions:
-        if len(sessions) >= MAX_SESSIONS:
-            # Drop the oldest 10% of sessions
-            evict = list(sessions.keys())[: MAX_SESSIONS // 10]
-            for k in evict:
-                del sessions[k]
-        sessions[session_id] = []
-    return sessions[session_id]
-
-
-def _trim_history(history: list[dict]) -> list[dict]:
-    """Keep the conversation within MAX_HISTORY messages."""
-    if len(history) > MAX_HISTORY:
-        # Always keep the first message (usually the greeting) and the tail
-        return history[:1] + history[-(MAX_HISTORY - 1):]
+    if session_id in sessions:
+        sessions.move_to_end(session_id)
+        return sessions[session_id]
+    if len(sessions) >= MAX_SESSIONS:
+        # Drop the least recently used 10% of sessions
+        for _ in range(MAX_SESSIONS // 10):
+            evicted, _ = sessions.popitem(last=False)
+            summaries.pop(evicted, None)
+            _last_turns.pop(evicted, None)
+            _pending_turns.pop(evicted, None)
+    history = sessions[session_id] = []
     return history
 
 
+def _trim_history(history: list[dict]) -> int:
+    """Keep the conversation within MAX_HISTORY messages, trimming in place. Returns how many were dropped."""
+    removed = len(history) - MAX_HISTORY
+    if removed <= 0:
+        return 0
+    # Always keep the first message (usually the greeting) and the tail
+    del history[1:removed + 1]
+    return removed
+
+
+def _duplicate_reply(session_id: str, history: list[dict], user_message: str) -> str | None:
+    """
+    Detect a double-submit: the same message again within _DUPLICATE_WINDOW_NS
+    of the first copy starting (still in flight) or being answered.
+
+    Returns the reply it already got, or None if this isn't a duplicate.
+    Raises 409 if the first copy is still being answered. Nothing is recorded
+    here: see _start_turn / _finish_turn / _end_turn.
+    """
+    now = time.monotonic_ns()
+    pending = _pending_turns.get(session_id)
+    if pending is not None and pending[0] == user_message and now - pending[1] <= _DUPLICATE_WINDOW_NS:
+        raise HTTPException(status_code=409, detail="Still working on that message.")
+    previous = _last_turns.get(session_id)
+    if previous is None or previous[0] != user_message or now - previous[1] > _DUPLICATE_WINDOW_NS:
+        return None
+    if (
+        len(history) >= 2
+        and history[-1]["role"] == "assistant"
+        and history[-2]["role"] == "user"
+        and history[-2]["content"] == user_message
+    ):
+        return history[-1]["content"]
+    return None
+
+
+def _start_turn(session_id: str, user_message: str) -> None:
+    """Mark a message as being answered by the LLM."""
+    _pending_turns[session_id] = (user_message, time.monotonic_ns())
+
+
+def _finish_turn(session_id: str, updated_history: list[dict]) -> None:
+    """Store an answered turn and remember it for _duplicate_reply."""
+    sessions[session_id] = updated_history
+    _last_turns[session_id] = (updated_history[-2]["content"], time.monotonic_ns())
+
+
+def _end_turn(session_id: str, user_message: str) -> None:
+    """Clear the in-flight mark, answered or not (a failed turn can be retried at once)."""
+    pending = _pending_turns.get(session_id)
+    if pending is not None and pending[0] == user_message:
+        del _pending_turns[session_id]
+
+
+async def _session_summary(
+    session_id: str,
+    history: list[dict],
+    user_message: str,
+    context: str | None,
+) -> HistorySummary | None:
+    """
+    Return the summary to send with this turn, refreshing the stored one when
+    due. A failed summary call just means this turn goes out without one.
+    A turn the LLM won't see (it's answered from cache) gets none.
+    """
+    if not needs_llm(history, user_message, context=context, session_id=session_id):
+        return None
+    try:
+        summary = await acompress_history(history, summaries.get(session_id))
+    except Exception:
+        logger.exception("History summary failed; sending full history")
+        return None
+    if summary is not None:
+        summaries[session_id] = summary
+    return summary
+
+
 def _wants_feed(message: str) -> bool:
     """Return True if the user's message is asking to see the feed."""
-    lower = message.lower()
-    return any(kw in lower for kw in FEED_KEYWORDS)
+    return _FEED_KEYWORDS_RE.search(message) is not None
+
+
+def _render_feed_reply(limit: int = 15) -> str:
+    """Return a ready-to-display assistant reply summarising recent items."""
+    items = get_feed_cached(limit=limit, with_reason=False)
+    if not items:
+        return "Nothing has been added yet. Want to be the first? Just tell me your name."
+
+    def describe(item: dict) -> str:
+        # The bold opening sentence is the hook; fall back to the start of the blurb
+        text = item["agreed_text"]
+        parts = text.split("**", 2)
+        hook = parts[1] if text.startswith("**") and len(parts) == 3 else text[:120]
+        return (
+            f"- **{item['submitter_name']}** ({item['created_at'][:10]}): "
+            f"{hook} [link]({item['url']})"
+        )
+
+    header = f"Here are the {len(items)} most recent item(s):\n"
+    footer = "\nWant to add one of your own?"
+    return "\n".join(chain((header,), map(describe, items), (footer,)))
 
 
 def _build_feed_context(limit: int = 15) -> str:
     """Return a text block describing recent items, to inject into LLM context."""
-    items = get_feed(limit=limit)
+    items = get_feed_cached(limit=limit, with_reason=False)
     if not items:
         return "FEED DATA: No items have been saved yet."
 
-    lines = [f"FEED DATA — {len(items)} most recent item(s):"]
-    for i, item in enumerate(items, 1):
-        lines.append(
-            f"\n[{i}] Added by {item['submitter_name']} on {item['created_at'][:10]}\n"
-            f"    URL: {item['url']}\n"
-            f"    Blurb: {item['agreed_text']}"
-        )
-    return "\n".join(lines)
+    header = f"FEED DATA — {len(items)} most recent item(s):"
+    return "\n".join(chain((header,), (
+        f"\n[{i}] Added by {item['submitter_name']} on {item['created_at'][:10]}\n"
+        f"    URL: {item['url']}\n"
+        f"    Blurb: {item['agreed_text']}"
+        for i, item in enumerate(items, 1)
+    )))
 
 
 def _extract_name_from_history(history: list[dict]) -> str | None:
@@ -163,24 +316,19 @@ def _extract_name_from_history(history: list[dict]) -> str | None:
     # The LLM consistently uses the contributor's name in replies.
     # A simple heuristic: look for the most recent assistant message that
     # contains a capitalised word following a greeting pattern.
-    import re as _re
-    greeting_pattern = _re.compile(
-        r"(?:hi|hello|thanks|thank you|great|perfect|sure|ok|okay)[,!]?\s+([A-Z][a-z]+)",
-        _re.IGNORECASE,
-    )
     # Walk history in reverse to find the most recent name usage
     for msg in reversed(history):
-        if msg.get("role") == "assistant":
-            m = greeting_pattern.search(msg.get("content", ""))
-            if m:
-                return m.group(1)
+        if msg.get("role") != "assistant":
+            continue
+        m = _GREETING_RE.search(msg.get("content", ""))
+        if m:
+            return m.group(1)
     return None
 
 
 def _wants_update(message: str) -> bool:
     """Return True if the user's message suggests they want to edit a previous item."""
-    lower = message.lower()
-    return any(kw in lower for kw in UPDATE_KEYWORDS)
+    return _UPDATE_KEYWORDS_RE.search(message) is not None
 
 
 def _build_items_context(name: str) -> str:
@@ -189,52 +337,72 @@ def _build_items_context(name: str) -> str:
     if not items:
         return f"CONTRIBUTOR ITEMS: No items found for '{name}'."
 
-    lines = [f"CONTRIBUTOR ITEMS — recent items submitted by {name}:"]
-    for item in items:
+    def describe(item: dict) -> str:
         status = "done" if item["done"] else "pending"
-        lines.append(
+        text = item["agreed_text"]
+        return (
             f"\n  ID {item['id']} ({status}) — added {item['created_at'][:10]}\n"
             f"  URL: {item['url']}\n"
-            f"  Blurb: {item['agreed_text'][:120]}{'…' if len(item['agreed_text']) > 120 else ''}"
+            f"  Blurb: {text[:120]}{'…' if len(text) > 120 else ''}"
         )
-    return "\n".join(lines)
+
+    header = f"CONTRIBUTOR ITEMS — recent items submitted by {name}:"
+    return "\n".join(chain((header,), map(describe, items)))
 
 
-def _parse_update_tag(response_text: str) -> tuple[str, dict | None]:
+def _strip_dashes(text: str) -> str:
     """
-    Look for an <UPDATE_ITEM>...</UPDATE_ITEM> block in the LLM response.
+    Remove em dashes and en-dashes used as em dashes from model output.
+    Numeric ranges ("2–4") get a plain hyphen; every other dash, spaced or
+    not, becomes ', '.
+    """
+    # Most responses contain no dashes at all — skip the work entirely
+    if "—" not in text and "–" not in text:
+        return text
+    text = _NUMERIC_RANGE_DASH_RE.sub("-", text)
+    # Em/en dash → comma-space (reads most naturally in running prose)
+    text = _DASH_RE.sub(", ", text)
+    # Clean up any double commas that result (e.g. "so, — then" → "so,, then")
+    return _DOUBLE_COMMA_RE.sub(",", text)
+
+
+def _parse_action_tag(response_text: str) -> tuple[str, dict | None]:
+    """
+    Look for a <SAVE_ITEM> or <UPDATE_ITEM> block in the LLM response and
+    apply it to the database. Parsing is done by llm.extract_action.
 
     Returns
     -------
-    (cleaned_text, updated_item | None)
+    (cleaned_text, item | None)
       cleaned_text  : response with the XML block stripped out
-      updated_item  : the dict returned by db.update_news_item, or None if no tag found
+      item          : the dict returned by db.save_news_item / db.update_news_item,
+                      or None if no complete tag was found
     """
-    pattern = re.compile(r"<UPDATE_ITEM>(.*?)</UPDATE_ITEM>", re.DOTALL | re.IGNORECASE)
-    match = pattern.search(response_text)
-    if not match:
+    cleaned, fields = extract_action(response_text)
+    if fields is None:
         return response_text, None
 
-    block = match.group(1)
-
-    def extract(tag: str) -> str:
-        m = re.search(rf"<{tag}>(.*?)</{tag}>", block, re.DOTALL | re.IGNORECASE)
-        return m.group(1).strip() if m else ""
-
-    item_id_str    = extract("id")
-    name           = extract("name")
-    url            = extract("url")
-    reason         = extract("reason")
-    agreed_text    = extract("agreed_text")
+    name        = fields.get("name", "")
+    url         = fields.get("url", "")
+    reason      = fields.get("reason", "")
+    agreed_text = fields.get("agreed_text", "")
 
-    if not all([item_id_str, name, url, reason, agreed_text]):
-        cleaned = pattern.sub("", response_text).strip()
+    if not all([name, url, reason, agreed_text]):
+        # Incomplete tag — don't save, just strip the block
         return cleaned, None
 
+    if fields["action"] == "SAVE":
+        saved = save_news_item(
+            submitter_name=name,
+            url=url,
+            reason=reason,
+            agreed_text=agreed_text,
+        )
+        return cleaned, saved
+
     try:
-        item_id = int(item_id_str)
+        item_id = int(fields.get("id", ""))
     except ValueError:
-        cleaned = pattern.sub("", response_text).strip()
         return cleaned, None
 
     updated = update_news_item(
@@ -244,65 +412,124 @@ def _parse_update_tag(response_text: str) -> tuple[str, dict | None]:
         reason=reason,
         agreed_text=agreed_text,
     )
-
-    cleaned = pattern.sub("", response_text).strip()
     return cleaned, updated
 
 
-def _strip_dashes(text: str) -> str:
+class _StreamFilter:
     """
-    Remove em dashes and en-dashes used as em dashes from model output.
-    Replaces ' — ' and ' – ' (spaced) with ', ' and unspaced variants with '-'.
+    Cleans streamed LLM output for display as it arrives.
+
+    Dashes are stripped and any <SAVE_ITEM>/<UPDATE_ITEM> block is hidden.
+    Text that could still change once more arrives is held back: trailing
+    whitespace, commas and dashes (a spaced dash may be split across chunks),
+    trailing digits (a numeric range keeps its dash), a '<' that might open
+    a tag, and everything inside an open block. The
+    authoritative cleaned response is still produced from the full text by
+    _strip_dashes and _parse_action_tag once the stream ends.
     """
-    # Spaced em dash → comma-space (reads most naturally in running prose)
-    text = re.sub(r'\s*—\s*', ', ', text)
-    # Spaced en dash used as a clause separator → comma-space
-    text = re.sub(r'\s*–\s*', ', ', text)
-    # Clean up any double commas that result (e.g. ", ,")
-    text = re.sub(r',\s*,', ',', text)
-    return text
-
 
-def _parse_save_tag(response_text: str) -> tuple[str, dict | None]:
+    _OPEN_TAGS = ("<save_item>", "<update_item>")
+    # Digits too: a dash between two of them is a numeric range ("2–4")
+    _HOLD_BACK = " \t\r\n,—–0123456789"
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._in_block = False
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk of raw output and return whatever is now safe to display."""
+        self._buf += chunk
+        out = []
+        while self._buf:
+            if self._in_block:
+                m = _ACTION_CLOSE_RE.search(self._buf)
+                if not m:
+                    break
+                self._buf = self._buf[m.end():]
+                self._in_block = False
+                continue
+
+            lt = self._buf.find("<")
+            if lt == -1:
+                safe = self._buf.rstrip(self._HOLD_BACK)
+                out.append(safe)
+                self._buf = self._buf[len(safe):]
+                break
+
+            out.append(self._buf[:lt])
+            self._buf = self._buf[lt:]
+            head = self._buf[:13].lower()
+            tag = next((t for t in self._OPEN_TAGS if head.startswith(t)), None)
+            if tag:
+                self._buf = self._buf[len(tag):]
+                self._in_block = True
+            elif any(t.startswith(head) for t in self._OPEN_TAGS):
+                break   # could still become an opening tag — wait for more
+            else:
+                out.append("<")
+                self._buf = self._buf[1:]
+        return _strip_dashes("".join(out))
+
+    def flush(self) -> str:
+        """Return any held-back text once the stream has ended."""
+        tail = "" if self._in_block else _strip_dashes(self._buf)
+        self._buf = ""
+        return tail
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Events frame with a JSON payload."""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
+async def _chat_event_stream(
+    session_id: str,
+    history: list[dict],
+    user_message: str,
+    context: str | None,
+) -> AsyncIterator[str]:
     """
-    Look for a <SAVE_ITEM>...</SAVE_ITEM> block in the LLM response.
-
-    Returns
-    -------
-    (cleaned_text, saved_item | None)
-      cleaned_text  : response with the XML block stripped out
-      saved_item    : the dict returned by db.save_news_item, or None if no tag found
-    """
-    pattern = re.compile(r"<SAVE_ITEM>(.*?)</SAVE_ITEM>", re.DOTALL | re.IGNORECASE)
-    match = pattern.search(response_text)
-    if not match:
-        return response_text, None
-
-    block = match.group(1)
-
-    def extract(tag: str) -> str:
-        m = re.search(rf"<{tag}>(.*?)</{tag}>", block, re.DOTALL | re.IGNORECASE)
-        return m.group(1).strip() if m else ""
+    Stream one chat turn as SSE frames.
 
-    name = extract("name")
-    url = extract("url")
-    reason = extract("reason")
-    agreed_text = extract("agreed_text")
+    Events
+    ------
+    delta : {"text": str}                       display text as it arrives
+    done  : {"response": str, "saved_item": …}  same shape as the JSON reply
+    error : {"detail": str}                     the LLM call failed
 
-    if not all([name, url, reason, agreed_text]):
-        # Incomplete tag — don't save, just strip the block
-        cleaned = pattern.sub("", response_text).strip()
-        return cleaned, None
-
-    saved = save_news_item(
-        submitter_name=name,
-        url=url,
-        reason=reason,
-        agreed_text=agreed_text,
-    )
-
-    cleaned = pattern.sub("", response_text).strip()
-    return cleaned, saved
+    The caller has already called _start_turn; this clears it when done.
+    """
+    try:
+        summary = await _session_summary(session_id, history, user_message, context)
+        stream_filter = _StreamFilter()
+        chunks = []
+        try:
+            async for chunk in llm_achat_stream(
+                history, user_message, context=context, summary=summary,
+                session_id=session_id,
+            ):
+                chunks.append(chunk)
+                text = stream_filter.feed(chunk)
+                if text:
+                    yield _sse("delta", {"text": text})
+        except Exception as exc:
+            yield _sse("error", {"detail": f"LLM request failed: {exc}"})
+            return
+
+        tail = stream_filter.flush()
+        if tail:
+            yield _sse("delta", {"text": tail})
+
+        raw_response = _strip_dashes("".join(chunks))
+        cleaned_response, saved_item = await asyncio.to_thread(_parse_action_tag, raw_response)
+
+        _finish_turn(session_id, history + [
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": cleaned_response},
+        ])
+        yield _sse("done", {"response": cleaned_response, "saved_item": saved_item})
+    finally:
+        _end_turn(session_id, user_message)
 
 
 # ---------------------------------------------------------------------------
@@ -312,6 +539,7 @@ def _parse_save_tag(response_text: str) -> tuple[str, dict | None]:
 class ChatRequest(BaseModel):
     session_id: str
     message: str
+    stream: bool = False    # reply as Server-Sent Events instead of one JSON body
 
 
 class ManualItemRequest(BaseModel):
@@ -329,6 +557,10 @@ class ManualItemRequest(BaseModel):
 @app.on_event("startup")
 def startup() -> None:
     init_db()
+    # A changed prompt means a cold prompt cache; logging its hash makes that
+    # easy to spot when comparing deploys. uvicorn's logger is used because
+    # it is the one configured to print at INFO.
+    logging.getLogger("uvicorn.error").info("SYSTEM_PROMPT sha256=%s", SYSTEM_PROMPT_SHA256)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -340,8 +572,8 @@ def chat_page(request: Request) -> HTMLResponse:
 
 
 @app.get("/feed", response_class=HTMLResponse)
-def feed_page(request: Request) -> HTMLResponse:
-    items = get_feed(limit=200)
+async def feed_page(request: Request) -> HTMLResponse:
+    items = await asyncio.to_thread(get_feed_cached, limit=200)
     pending = sum(1 for i in items if not i["done"])
     return templates.TemplateResponse(
         "feed.html",
@@ -356,7 +588,7 @@ def feed_page(request: Request) -> HTMLResponse:
 
 
 @app.get("/api/new-session")
-def new_session() -> JSONResponse:
+def new_session() -> ORJSONResponse:
     """
     Create a fresh session and return the standard opening greeting.
     The greeting is hardcoded so it's always exactly right and costs no LLM call.
@@ -367,12 +599,12 @@ def new_session() -> JSONResponse:
         "If you have no idea how this works, let me know and I'll explain. "
         "Or, if you do know how it works, just tell me your name and we'll get going."
     )
-    sessions[session_id] = [{"role": "assistant", "content": greeting}]
-    return JSONResponse({"session_id": session_id, "greeting": greeting})
+    _get_or_create_session(session_id).append({"role": "assistant", "content": greeting})
+    return ORJSONResponse({"session_id": session_id, "greeting": greeting})
 
 
 @app.post("/api/chat")
-def chat_endpoint(request: Request, body: ChatRequest) -> JSONResponse:
+async def chat_endpoint(request: Request, body: ChatRequest) -> Response:
     """
     Process a user message and return the assistant's response.
 
@@ -382,26 +614,59 @@ def chat_endpoint(request: Request, body: ChatRequest) -> JSONResponse:
       "response": str,          # cleaned assistant response (XML tags stripped)
       "saved_item": dict | null # populated if an item was saved this turn
     }
+
+    With "stream": true in the request the reply is usually a text/event-stream
+    instead (see _chat_event_stream), ending in a "done" event carrying the
+    same JSON. Replies that don't involve the LLM are always plain JSON.
     """
     client_ip = request.headers.get("X-Forwarded-For", request.client.host if request.client else "unknown").split(",")[0].strip()
     if not _check_rate_limit(client_ip):
         raise HTTPException(status_code=429, detail="Too many requests. Please slow down.")
 
     history = _get_or_create_session(body.session_id)
-    history = _trim_history(history)
+    removed = _trim_history(history)
+    stored = summaries.get(body.session_id)
+    if removed and stored is not None:
+        # The dropped messages sit just after the greeting, inside the span the
+        # summary covers, so it still holds; it just covers fewer messages now
+        if stored.covered > removed:
+            summaries[body.session_id] = HistorySummary(stored.covered - removed, stored.text)
+        else:
+            summaries.pop(body.session_id)
 
     user_message = body.message.strip()
     if not user_message:
         raise HTTPException(status_code=400, detail="Message cannot be empty.")
 
+    # A double-submit gets the reply the first copy got, with no LLM call and
+    # no second save
+    duplicate = _duplicate_reply(body.session_id, history, user_message)
+    if duplicate is not None:
+        return ORJSONResponse({"response": duplicate, "saved_item": None})
+
+    # A bare request for the feed or for how this works doesn't need the LLM:
+    # answer the first from SQLite and the second with fixed text.
+    intent = detect_intent(user_message)
+    reply = None
+    if intent == "feed" and settings.bypass_llm_for_feed:
+        reply = await asyncio.to_thread(_render_feed_reply)
+    elif intent == "howto" and settings.bypass_llm_for_howto:
+        reply = HOWTO_REPLY
+    if reply is not None:
+        sessions[body.session_id] = history + [
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": reply},
+        ]
+        return ORJSONResponse({"response": reply, "saved_item": None})
+
     # If the user is asking about the feed, inject current feed data as context.
     # If they want to update something, try to identify their name from history
     # and inject their recent items so the LLM can help them pick one.
-    effective_message = user_message
+    # The context travels with this turn only; it isn't stored in the history.
+    context = None
     if _wants_feed(user_message):
-        feed_context = _build_feed_context()
-        effective_message = (
-            f"{user_message}\n\n"
+        feed_context = await asyncio.to_thread(_build_feed_context)
+        context = (
             f"[SYSTEM NOTE — for assistant only, do not quote verbatim]\n"
             f"{feed_context}"
         )
@@ -410,33 +675,48 @@ def chat_endpoint(request: Request, body: ChatRequest) -> JSONResponse:
     #     contributor_name = _extract_name_from_history(history)
     #     if contributor_name:
     #         items_context = _build_items_context(contributor_name)
-    #         effective_message = (
-    #             f"{user_message}\n\n"
+    #         context = (
     #             f"[SYSTEM NOTE — for assistant only, do not quote verbatim]\n"
     #             f"{items_context}"
     #         )
 
-    try:
-        raw_response, updated_history = llm_chat(history, effective_message)
-    except Exception as exc:
-        raise HTTPException(
-            status_code=502,
-            detail=f"LLM request failed: {exc}",
-        )
-
-    # Strip em/en dashes before anything else touches the response
-    raw_response = _strip_dashes(raw_response)
-
-    # Parse and strip any <SAVE_ITEM> or <UPDATE_ITEM> tag, writing to DB if present
-    cleaned_response, saved_item = _parse_save_tag(raw_response)
-    if saved_item is None:
-        cleaned_response, saved_item = _parse_update_tag(cleaned_response)
+    # From here until the reply is stored, a resend of this message is a 409
+    _start_turn(body.session_id, user_message)
 
-    # Persist updated history (use cleaned response so history stays tidy)
-    updated_history[-1]["content"] = cleaned_response
-    sessions[body.session_id] = updated_history
+    if body.stream:
+        return StreamingResponse(
+            _chat_event_stream(body.session_id, history, user_message, context),
+            media_type="text/event-stream",
+            # Stop nginx and friends from buffering the stream
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
-    return JSONResponse(
+    try:
+        summary = await _session_summary(body.session_id, history, user_message, context)
+        try:
+            raw_response, updated_history = await llm_achat(
+                history, user_message, context=context, summary=summary,
+                session_id=body.session_id,
+            )
+        except Exception as exc:
+            raise HTTPException(
+                status_code=502,
+                detail=f"LLM request failed: {exc}",
+            )
+
+        # Strip em/en dashes before anything else touches the response
+        raw_response = _strip_dashes(raw_response)
+
+        # Parse and strip any <SAVE_ITEM> or <UPDATE_ITEM> tag, writing to DB if present
+        cleaned_response, saved_item = await asyncio.to_thread(_parse_action_tag, raw_response)
+
+        # Persist updated history (use cleaned response so history stays tidy)
+        updated_history[-1]["content"] = cleaned_response
+        _finish_turn(body.session_id, updated_history)
+    finally:
+        _end_turn(body.session_id, user_message)
+
+    return ORJSONResponse(
         {
             "response": cleaned_response,
             "saved_item": saved_item,
@@ -445,37 +725,39 @@ def chat_endpoint(request: Request, body: ChatRequest) -> JSONResponse:
 
 
 @app.get("/api/feed")
-def api_feed() -> JSONResponse:
+async def api_feed() -> ORJSONResponse:
     """Return the full feed as JSON (for the feed page and any external consumers)."""
-    items = get_feed(limit=200)
-    return JSONResponse({"count": len(items), "items": items})
+    items = await asyncio.to_thread(get_feed_cached, limit=200)
+    return ORJSONResponse({"count": len(items), "items": items})
 
 
 @app.post("/api/done/{item_id}")
-def set_done(item_id: int, done: bool = True) -> JSONResponse:
+async def set_done(item_id: int, done: bool = True) -> ORJSONResponse:
     """Toggle the done flag on a news item. Pass ?done=false to undo."""
-    mark_done(item_id, done)
-    return JSONResponse({"ok": True, "id": item_id, "done": done})
+    await asyncio.to_thread(mark_done, item_id, done)
+    return ORJSONResponse({"ok": True, "id": item_id, "done": done})
 
 
 @app.delete("/api/item/{item_id}")
-def delete_item(item_id: int) -> JSONResponse:
+async def delete_item(item_id: int) -> ORJSONResponse:
     """Permanently delete a news item."""
-    delete_news_item(item_id)
-    return JSONResponse({"ok": True, "id": item_id})
+    await asyncio.to_thread(delete_news_item, item_id)
+    return ORJSONResponse({"ok": True, "id": item_id})
 
 
 @app.post("/api/item/{item_id}/delete")
-def delete_item_post(item_id: int) -> JSONResponse:
+async def delete_item_post(item_id: int) -> ORJSONResponse:
     """Delete a news item via POST (proxy-safe alternative to DELETE)."""
-    delete_news_item(item_id)
-    return JSONResponse({"ok": True, "id": item_id})
+    await asyncio.to_thread(delete_news_item, item_id)
+    return ORJSONResponse({"ok": True, "id": item_id})
 
 
 @app.get("/newsletter", response_class=HTMLResponse)
-def newsletter_page(request: Request) -> HTMLResponse:
+async def newsletter_page(request: Request) -> HTMLResponse:
     """Formatted newsletter view — pending (not-done) items only."""
-    items = get_feed(limit=200, include_done=False)
+    items = await asyncio.to_thread(
+        get_feed_cached, limit=200, include_done=False, with_reason=False
+    )
     return templates.TemplateResponse(
         "newsletter.html",
         {"request": request, "title": settings.app_title, "items": items},
@@ -492,7 +774,7 @@ def add_manual_page(request: Request) -> HTMLResponse:
 
 
 @app.post("/api/add-manual")
-def add_manual(body: ManualItemRequest) -> JSONResponse:
+async def add_manual(body: ManualItemRequest) -> ORJSONResponse:
     """
     Save a manually submitted news item.
 
@@ -516,13 +798,14 @@ def add_manual(body: ManualItemRequest) -> JSONResponse:
 
     agreed_text = f"**{body.headline.strip()}** {body.entry.strip()}"
 
-    saved = save_news_item(
+    saved = await asyncio.to_thread(
+        save_news_item,
         submitter_name=body.name.strip(),
         url=body.url.strip(),
         reason=body.reason.strip(),
         agreed_text=agreed_text,
     )
-    return JSONResponse({"ok": True, "saved_item": saved})
+    return ORJSONResponse({"ok": True, "saved_item": saved})
 
 
 # ---------------------------------------------------------------------------
@@ -17,6 +17,14 @@ class Settings(BaseSettings):
     # Defaults to Claude 3.5 Haiku — fast, cheap, great for conversational tasks
     model: str = "anthropic/claude-3-5-haiku-20241022"
 
+    # Model to retry on when `model` can't be reached or is rate limited;
+    # empty disables the fallback
+    fallback_model: str = ""
+
+    # Nucleus sampling cutoff sent with every request; unset by default, as
+    # some models reject requests that set both top_p and temperature
+    top_p: float | None = None
+
     # Path to the SQLite database file
     db_path: str = "news.db"
 
@@ -27,6 +35,26 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
 
+    # Answer plain "show me the feed" style messages straight from SQLite,
+    # skipping the LLM round-trip. Off by default: the reply is a fixed-format
+    # list rather than the model's conversational summary.
+    bypass_llm_for_feed: bool = False
+
+    # Likewise answer a bare "how does this work?" with fixed text (see intents.py)
+    bypass_llm_for_howto: bool = False
+
+    # Reuse LLM replies to the opening turns of a conversation (e.g. "how does
+    # this work?") across contributors. See response_cache.py.
+    enable_response_cache: bool = False
+
+    # Send only the last N history messages verbatim and replace older ones
+    # with a rolling summary, refreshed every `history_summary_every` messages.
+    # 0 sends the whole conversation every turn.
+    history_keep_last: int = 0
+    history_summary_every: int = 10
+    # Model used for those summaries; empty means use `model`
+    summary_model: str = ""
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -15,18 +15,66 @@ news_items
 """
 
 import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
 from config import settings
 
+# Columns for list views that never show the private reason field
+_LIST_COLUMNS = "id, submitter_name, url, agreed_text, created_at, done"
+
+# One long-lived connection shared by every request thread. It runs in
+# autocommit mode (isolation_level=None), so each statement commits on its own;
+# _write_lock serialises writers so an INSERT and its read-back stay paired.
+_conn: sqlite3.Connection | None = None
+_conn_lock = threading.Lock()
+_write_lock = threading.Lock()
+
+# Short-lived read cache for get_feed_cached:
+#   { (limit, include_done, with_reason): (fetched_at, items) }
+# Every function that writes to news_items calls _invalidate_feed_cache(),
+# which clears it and bumps _feed_generation. A read only stores its result
+# if the generation is unchanged, so a read that overlapped a write can't
+# put the old rows back.
+_feed_cache: dict[tuple[int, bool, bool], tuple[float, list[dict]]] = {}
+_feed_generation = 0
+_feed_cache_lock = threading.Lock()
+_FEED_CACHE_TTL = 5.0   # seconds
+
 
 def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(settings.db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Return the shared connection, opening it (and setting pragmas) on first use."""
+    global _conn
+    if _conn is None:
+        with _conn_lock:
+            if _conn is None:
+                conn = sqlite3.connect(
+                    settings.db_path,
+                    check_same_thread=False,
+                    isolation_level=None,
+                )
+                conn.row_factory = sqlite3.Row
+                # WAL lets readers proceed while a write is in flight
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA mmap_size=67108864")   # 64 MiB
+                _conn = conn
+    return _conn
+
+
+def _invalidate_feed_cache() -> None:
+    """Drop cached feed reads after a write."""
+    global _feed_generation
+    with _feed_cache_lock:
+        _feed_generation += 1
+        _feed_cache.clear()
 
 
 def init_db() -> None:
     """Create tables if they don't already exist."""
-    with get_connection() as conn:
+    conn = get_connection()
+    with _write_lock:
         conn.execute("""
             CREATE TABLE IF NOT EXISTS news_items (
                 id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -44,7 +92,18 @@ def init_db() -> None:
             conn.execute("ALTER TABLE news_items ADD COLUMN done INTEGER NOT NULL DEFAULT 0")
         except sqlite3.OperationalError:
             pass  # column already exists
-        conn.commit()
+        # Indexes for the per-contributor lookup (case-insensitive) and the
+        # newest-first feed queries, with and without done items
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_name_lower"
+            " ON news_items(lower(submitter_name), created_at DESC)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_created_desc ON news_items(created_at DESC)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_done_created ON news_items(done, created_at DESC)"
+        )
 
 
 def save_news_item(
@@ -54,24 +113,26 @@ def save_news_item(
     agreed_text: str,
 ) -> dict:
     """Insert a new news item and return the full saved record."""
-    with get_connection() as conn:
+    # Timestamp is set here rather than by the column default so the record
+    # can be returned without reading the row back.
+    item = {
+        "submitter_name": submitter_name.strip(),
+        "url": url.strip(),
+        "reason": reason.strip(),
+        "agreed_text": agreed_text.strip(),
+        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    conn = get_connection()
+    with _write_lock:
         cursor = conn.execute(
             """
-            INSERT INTO news_items (submitter_name, url, reason, agreed_text)
-            VALUES (?, ?, ?, ?)
+            INSERT INTO news_items (submitter_name, url, reason, agreed_text, created_at)
+            VALUES (:submitter_name, :url, :reason, :agreed_text, :created_at)
             """,
-            (
-                submitter_name.strip(),
-                url.strip(),
-                reason.strip(),
-                agreed_text.strip(),
-            ),
+            item,
         )
-        conn.commit()
-        row = conn.execute(
-            "SELECT * FROM news_items WHERE id = ?", (cursor.lastrowid,)
-        ).fetchone()
-        return dict(row)
+        _invalidate_feed_cache()
+    return {"id": cursor.lastrowid, **item, "done": 0}
 
 
 def update_news_item(
@@ -82,7 +143,8 @@ def update_news_item(
     agreed_text: str,
 ) -> dict:
     """Update an existing news item and return the updated record."""
-    with get_connection() as conn:
+    conn = get_connection()
+    with _write_lock:
         conn.execute(
             """
             UPDATE news_items
@@ -91,7 +153,7 @@ def update_news_item(
             """,
             (submitter_name.strip(), url.strip(), reason.strip(), agreed_text.strip(), item_id),
         )
-        conn.commit()
+        _invalidate_feed_cache()
         row = conn.execute(
             "SELECT * FROM news_items WHERE id = ?", (item_id,)
         ).fetchone()
@@ -99,56 +161,79 @@ def update_news_item(
 
 
 def get_items_by_name(submitter_name: str, limit: int = 10) -> list[dict]:
-    """Return recent items submitted by a given name (case-insensitive)."""
-    with get_connection() as conn:
-        rows = conn.execute(
-            """
-            SELECT * FROM news_items
-            WHERE lower(submitter_name) = lower(?)
-            ORDER BY created_at DESC
-            LIMIT ?
-            """,
-            (submitter_name.strip(), limit),
-        ).fetchall()
-        return [dict(row) for row in rows]
+    """Return recent items submitted by a given name (case-insensitive), without reasons."""
+    rows = get_connection().execute(
+        f"""
+        SELECT {_LIST_COLUMNS} FROM news_items
+        WHERE lower(submitter_name) = lower(?)
+        ORDER BY created_at DESC
+        LIMIT ?
+        """,
+        (submitter_name.strip(), limit),
+    ).fetchall()
+    return [dict(row) for row in rows]
 
 
 def mark_done(item_id: int, done: bool = True) -> None:
     """Set the done flag on a news item."""
-    with get_connection() as conn:
+    conn = get_connection()
+    with _write_lock:
         conn.execute(
             "UPDATE news_items SET done = ? WHERE id = ?",
             (int(done), item_id),
         )
-        conn.commit()
-
-
-def get_feed(limit: int = 50, include_done: bool = True) -> list[dict]:
-    """Return the most recent news items, newest first."""
-    with get_connection() as conn:
-        if include_done:
-            rows = conn.execute(
-                "SELECT * FROM news_items ORDER BY created_at DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                "SELECT * FROM news_items WHERE done = 0 ORDER BY created_at DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
-        return [dict(row) for row in rows]
+        _invalidate_feed_cache()
+
+
+def get_feed(
+    limit: int = 50,
+    include_done: bool = True,
+    with_reason: bool = True,
+) -> list[dict]:
+    """
+    Return the most recent news items, newest first.
+    Pass with_reason=False to skip the private reason column when it isn't shown.
+    """
+    columns = "*" if with_reason else _LIST_COLUMNS
+    where = "" if include_done else "WHERE done = 0 "
+    rows = get_connection().execute(
+        f"SELECT {columns} FROM news_items {where}ORDER BY created_at DESC LIMIT ?",
+        (limit,),
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_feed_cached(
+    limit: int = 50,
+    include_done: bool = True,
+    with_reason: bool = True,
+) -> list[dict]:
+    """
+    Like get_feed, but serves repeat reads from memory for up to
+    _FEED_CACHE_TTL seconds. The returned list is shared — don't mutate it.
+    """
+    key = (limit, include_done, with_reason)
+    hit = _feed_cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < _FEED_CACHE_TTL:
+        return hit[1]
+    generation = _feed_generation
+    items = get_feed(limit=limit, include_done=include_done, with_reason=with_reason)
+    with _feed_cache_lock:
+        if generation == _feed_generation:
+            _feed_cache[key] = (time.monotonic(), items)
+    return items
 
 
 def delete_news_item(item_id: int) -> None:
     """Permanently delete a news item by ID."""
-    with get_connection() as conn:
+    conn = get_connection()
+    with _write_lock:
         conn.execute("DELETE FROM news_items WHERE id = ?", (item_id,))
-        conn.commit()
+        _invalidate_feed_cache()
 
 
 def get_item_count() -> int:
     """Return the total number of saved news items."""
-    with get_connection() as conn:
-        return conn.execute(
-            "SELECT COUNT(*) AS n FROM news_items"
-        ).fetchone()["n"]
+    return get_connection().execute(
+        "SELECT COUNT(*) AS n FROM news_items"
+    ).fetchone()["n"]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+"""
+intents.py — Cheap classification of chat messages that don't need the LLM.
+
+Two of the branches in SYSTEM_PROMPT produce near-fixed output: listing the
+feed, and explaining how the tool works. When a message is clearly one of
+those and nothing else, app.py can answer it directly instead of making an
+LLM call. Anything ambiguous is classed as "chat" and goes to the model as
+usual, so the patterns are deliberately narrow: anchored, and only applied
+to short messages.
+"""
+
+import re
+from typing import Literal
+
+Intent = Literal["feed", "howto", "chat"]
+
+# Messages longer than this are never treated as a bare feed/how-to request
+_MAX_LEN = 40
+
+# "show me the feed", "what's latest?", "list recent items"
+_FEED_RE = re.compile(
+    r"^(?:show|list|what.?s)\b.*\b(?:feed|items|entries|recent|latest)\??$",
+    re.IGNORECASE,
+)
+
+# "how does this work?", "what is this?", "what do I do", optionally after a "hi"
+_HOWTO_RE = re.compile(
+    r"^(?:(?:hi|hello|hey)\b[\s,!.]*)?"
+    r"(?:how does (?:this|it) work|how do i use (?:this|it)|what is this(?: for)?"
+    r"|what.?s this(?: for)?|what do i do|what am i supposed to do)"
+    r"[\s?!.]*$",
+    re.IGNORECASE,
+)
+
+# Mirrors the IF ASKED HOW IT WORKS section of SYSTEM_PROMPT
+HOWTO_REPLY = (
+    "It's simple:\n\n"
+    "1. Chat here to add a news item. I'll help you shape it into newsletter copy.\n"
+    "2. Once it's saved, you can come back and update or correct it if needed. Just say so.\n"
+    "3. To see what's been collected so far, or to view the formatted newsletter ready "
+    "to paste into email, use the links at the top of the page.\n\n"
+    "Got something to add?"
+)
+
+
+def detect_intent(message: str) -> Intent:
+    """Return "feed" or "howto" for a bare request of that kind, otherwise "chat"."""
+    message = message.strip()
+    if len(message) > _MAX_LEN:
+        return "chat"
+    if _FEED_RE.match(message):
+        return "feed"
+    if _HOWTO_RE.match(message):
+        return "howto"
+    return "chat"
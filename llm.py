@@ -19,9 +19,32 @@ Conversation flow
 7. Confirm the final text, then emit <SAVE_ITEM>...</SAVE_ITEM>
 """
 
-from openai import OpenAI
+import asyncio
+import hashlib
+import logging
+import re
+from collections.abc import AsyncIterator, Generator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING
+
 from config import settings
+from response_cache import ResponseCache, early_turn_key, exact_key
+
+# openai (and the httpx/pydantic schema it pulls in) is imported on first use
+# in _get_client()/_get_async_client(), so importing this module stays cheap
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
 
+logger = logging.getLogger(__name__)
+
+# SYSTEM_PROMPT must stay a constant, byte-identical across every request:
+# providers cache prompts by prefix, and it is always message 0. Anything
+# dynamic (feed data, a contributor's items, names, dates) belongs in the
+# `context` argument of chat()/achat()/achat_stream(), which is sent after
+# the conversation history — never interpolate it into SYSTEM_PROMPT.
 
 SYSTEM_PROMPT = """HOW TO BEHAVE
 -------------
@@ -181,7 +204,468 @@ RULES
 """
 
 
-def chat(history: list[dict], user_message: str) -> tuple[str, list[dict]]:
+# Logged by app.py at startup so a changed prompt (and the cache miss it
+# causes) is easy to spot when comparing deploys.
+SYSTEM_PROMPT_SHA256 = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()
+
+
+# <SAVE_ITEM>...</SAVE_ITEM> or <UPDATE_ITEM>...</UPDATE_ITEM>; group 1 is the action
+_ACTION_RE = re.compile(r"<(SAVE|UPDATE)_ITEM>(.*?)</\1_ITEM>", re.DOTALL | re.IGNORECASE)
+
+# Any <field>...</field> pair inside a SAVE_ITEM / UPDATE_ITEM block
+_FIELD_RE = re.compile(r"<(\w+)>(.*?)</\1>", re.DOTALL | re.IGNORECASE)
+
+
+def extract_action(text: str) -> tuple[str, dict | None]:
+    """
+    Find the first <SAVE_ITEM> or <UPDATE_ITEM> block in a reply.
+
+    Returns
+    -------
+    (visible_text, action | None)
+      visible_text : the reply with action blocks removed (unchanged if there are none)
+      action       : {"action": "SAVE" | "UPDATE", <field>: <value>, ...} with field
+                     names lowercased, or None if no complete block was found
+
+    The reply is scanned once: the text before the block is kept as is, and
+    only the text after it is checked for further blocks. Fields are read
+    with a regex rather than an XML parser, since blurbs can contain a bare &.
+    """
+    # Every tag starts with "<"; most replies contain none, and a plain
+    # substring test rejects them without entering the regex engine
+    if "<" not in text:
+        return text, None
+    match = _ACTION_RE.search(text)
+    if not match:
+        return text, None
+
+    visible = (text[:match.start()] + _ACTION_RE.sub("", text[match.end():])).strip()
+
+    # The first occurrence of a field wins
+    action = {"action": match.group(1).upper()}
+    for m in _FIELD_RE.finditer(match.group(2)):
+        action.setdefault(m.group(1).lower(), m.group(2).strip())
+    return visible, action
+
+
+def _client_options() -> dict:
+    """Constructor arguments shared by the sync and async OpenRouter clients."""
+    from openai import Timeout   # httpx.Timeout, re-exported
+
+    return {
+        "base_url": "https://openrouter.ai/api/v1",
+        "api_key": settings.openrouter_api_key,
+        # Bounded so a stuck connection can't hold a worker indefinitely;
+        # streamed replies get _STREAM_TIMEOUT instead
+        "timeout": Timeout(30.0, connect=5.0),
+        "max_retries": 2,
+        "default_headers": {
+            "HTTP-Referer": "http://localhost",
+            "X-Title": settings.app_title,
+        },
+    }
+
+
+def _system_message() -> dict:
+    """
+    Build the system message carrying SYSTEM_PROMPT (once, as _SYSTEM_MESSAGE).
+
+    For Anthropic models on OpenRouter the prompt is sent as a content block
+    marked cache_control=ephemeral, so the provider serves it from its prompt
+    cache instead of re-processing it every turn. Other providers cache a
+    byte-identical prefix automatically and get the plain string form.
+
+    Anthropic only caches prompts above a minimum length: 2048 tokens for the
+    Haiku models, 1024 for Sonnet and Opus. SYSTEM_PROMPT is about 1.7k tokens,
+    so with the default Haiku model the marker currently has no effect; it
+    starts to pay off on Sonnet/Opus, or if the prompt grows past 2048 tokens.
+    """
+    if settings.model.startswith("anthropic/"):
+        return {
+            "role": "system",
+            "content": [{
+                "type": "text",
+                "text": SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"},
+            }],
+        }
+    return {"role": "system", "content": SYSTEM_PROMPT}
+
+
+# Built once at import and shared by every request; never mutate it.
+_SYSTEM_MESSAGE = _system_message()
+
+
+def _extra_body() -> dict | None:
+    """Provider-specific request fields (an OpenAI prompt-cache routing key)."""
+    if settings.model.startswith("openai/"):
+        return {"prompt_cache_key": settings.app_title}
+    return None
+
+
+@dataclass
+class HistorySummary:
+    """A rolling summary standing in for the first `covered` messages of a history."""
+    covered: int
+    text: str
+
+
+SUMMARY_PROMPT = """Summarise the conversation below between a newsletter contributor and an
+editorial assistant, so the assistant can carry on without the full transcript.
+
+Keep, where known:
+- the contributor's name
+- the URL of the item
+- their reason for adding it, as close to verbatim as possible
+- the latest draft of the newsletter copy, exactly as last shown
+- what feedback they've given on it and whether they've approved it
+
+Plain text, no preamble. Be brief."""
+
+
+def _build_messages(
+    history: list[dict],
+    user_message: str,
+    context: str | None = None,
+    summary: HistorySummary | None = None,
+) -> list[dict]:
+    """
+    Assemble the outgoing messages: the fixed system prompt first, then the
+    conversation, then the new user turn. Per-request context rides on that
+    final turn only, so it never disturbs the cached prefix and is not kept
+    in the history. With a summary, the messages it covers are left out and
+    the summary travels on the final turn too, ahead of any context, rather
+    than as a mid-conversation system message (which not every provider
+    accepts).
+    """
+    messages = [_SYSTEM_MESSAGE]
+    if summary is None:
+        messages.extend(history)
+    else:
+        messages.extend(islice(history, summary.covered, None))
+    notes = [user_message]
+    if summary is not None:
+        notes.append(
+            "[SYSTEM NOTE — for assistant only, do not quote verbatim]\n"
+            f"Summary of the conversation before the messages above:\n{summary.text}"
+        )
+    if context is not None:
+        notes.append(context)
+    messages.append({"role": "user", "content": "\n\n".join(notes)})
+    return messages
+
+
+def _updated_history(history: list[dict], user_message: str, response_text: str) -> list[dict]:
+    """Return a new history with this turn's user message and reply appended."""
+    return [
+        *history,
+        {"role": "user", "content": user_message},
+        {"role": "assistant", "content": response_text},
+    ]
+
+
+def _summary_due(history: list[dict], summary: HistorySummary | None) -> int | None:
+    """
+    Return how many leading messages a fresh summary should cover, or None if
+    the current one (possibly none at all) is still good enough.
+    """
+    keep = settings.history_keep_last
+    if keep <= 0 or len(history) <= keep + 2:
+        return None
+    older = len(history) - keep
+    if summary is not None and older - summary.covered < settings.history_summary_every:
+        return None
+    return older
+
+
+def _summary_request(history: list[dict]) -> dict:
+    """Arguments for the completion call that summarises `history`."""
+    transcript = "\n\n".join(f"{m['role'].upper()}: {m['content']}" for m in history)
+    return {
+        "model": settings.summary_model or settings.model,
+        "messages": [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": transcript},
+        ],
+        "temperature": 0,
+    }
+
+
+def compress_history(
+    history: list[dict],
+    summary: HistorySummary | None = None,
+) -> HistorySummary | None:
+    """
+    Return the summary to send with the next turn, refreshing it when due.
+
+    Only active when settings.history_keep_last > 0. The summary is
+    regenerated every settings.history_summary_every messages, so most turns
+    reuse the previous one; the caller keeps it between turns and passes it
+    to chat() as `summary`. Returns None while the whole history should still
+    be sent verbatim.
+    """
+    covered = _summary_due(history, summary)
+    if covered is None:
+        return summary if settings.history_keep_last > 0 else None
+    response = _get_client().chat.completions.create(**_summary_request(history[:covered]))
+    return HistorySummary(covered, response.choices[0].message.content or "")
+
+
+async def acompress_history(
+    history: list[dict],
+    summary: HistorySummary | None = None,
+) -> HistorySummary | None:
+    """Async version of compress_history()."""
+    covered = _summary_due(history, summary)
+    if covered is None:
+        return summary if settings.history_keep_last > 0 else None
+    response = await _get_async_client().chat.completions.create(
+        **_summary_request(history[:covered])
+    )
+    return HistorySummary(covered, response.choices[0].message.content or "")
+
+
+# Replies to exact repeats of a turn within one session (retries, double-submits)
+_recent_replies = ResponseCache(maxsize=512)
+# Replies to opening turns, shared across sessions (see response_cache.py)
+_early_replies = ResponseCache(maxsize=10_000)
+
+
+# The assistant's approval question (see RULES in SYSTEM_PROMPT). The turn
+# after it is a save or a redraft, which should come out the same every time.
+_APPROVAL_QUESTION = "Shall I go ahead and save that?"
+
+
+def _pick_temperature(history: list[dict]) -> float:
+    """
+    Low temperature for formulaic turns (the opening exchange, and answering
+    the approval question), the usual 0.7 for drafting. Steadier replies on
+    those turns also make the response caches more useful.
+    """
+    if len(history) <= 2:
+        return 0.2
+    last = history[-1]
+    if last["role"] == "assistant" and _APPROVAL_QUESTION in last["content"]:
+        return 0.2
+    return 0.7
+
+
+# Reply to a blank message, which isn't worth an LLM call (nor a place in the history)
+_EMPTY_TURN_REPLY = "Could you type that again?"
+
+
+@dataclass
+class _Turn:
+    """A conversation turn, either answered without the LLM or ready to send."""
+    history: list[dict]
+    user_message: str
+    reply: str | None = None                    # answer that needs no LLM call...
+    updated_history: list[dict] | None = None   # ...and the history to return with it
+    cache_keys: tuple[bytes | None, tuple | None] | None = None
+    request: dict | None = None                 # otherwise, the arguments for _create()
+
+
+def _lookup_turn(
+    history: list[dict],
+    user_message: str,
+    context: str | None,
+    temperature: float | None,
+    session_id: str | None,
+) -> tuple[_Turn, float]:
+    """
+    Answer a turn without the LLM if possible: a blank message, or a reply
+    already in the caches. Returns the turn (with reply set if answered) and
+    the temperature it would be sampled at.
+    """
+    if temperature is None:
+        temperature = _pick_temperature(history)
+    if not user_message.strip():
+        blank = _Turn(history, user_message, reply=_EMPTY_TURN_REPLY, updated_history=list(history))
+        return blank, temperature
+
+    cache_keys = _cache_keys(history, user_message, context, temperature, session_id)
+    cached = _cached_reply(cache_keys)
+    if cached is not None:
+        return _Turn(
+            history, user_message,
+            reply=cached, updated_history=_updated_history(history, user_message, cached),
+        ), temperature
+    return _Turn(history, user_message, cache_keys=cache_keys), temperature
+
+
+def _prepare_turn(
+    history: list[dict],
+    user_message: str,
+    context: str | None,
+    summary: HistorySummary | None,
+    temperature: float | None,
+    session_id: str | None,
+) -> _Turn:
+    """
+    Everything chat(), achat(), chat_stream() and achat_stream() do before
+    calling the LLM: answer the turn from _lookup_turn() if it can be, or
+    else build the request.
+    """
+    turn, temperature = _lookup_turn(history, user_message, context, temperature, session_id)
+    if turn.reply is None:
+        turn.request = {
+            "messages": _build_messages(history, user_message, context, summary),
+            **_sampling(temperature),
+            "extra_body": _extra_body(),
+        }
+    return turn
+
+
+def needs_llm(
+    history: list[dict],
+    user_message: str,
+    *,
+    context: str | None = None,
+    temperature: float | None = None,
+    session_id: str | None = None,
+) -> bool:
+    """
+    Return True if chat() etc. would call the LLM for this turn, i.e. it is
+    neither blank nor cached. Lets callers skip preparation (such as a
+    history summary) that a cached reply would not use.
+    """
+    turn, _ = _lookup_turn(history, user_message, context, temperature, session_id)
+    return turn.reply is None
+
+
+def _finish_turn(turn: _Turn, response_text: str) -> list[dict]:
+    """Cache the LLM's reply to a prepared turn and return the updated history."""
+    _remember_reply(turn.cache_keys, response_text)
+    return _updated_history(turn.history, turn.user_message, response_text)
+
+
+def _sampling(temperature: float) -> dict:
+    """
+    Sampling arguments for a chat request. top_p is only sent when configured:
+    some models reject requests that set both it and temperature.
+    """
+    if settings.top_p is None:
+        return {"temperature": temperature}
+    return {"temperature": temperature, "top_p": settings.top_p}
+
+
+def _cache_keys(
+    history: list[dict],
+    user_message: str,
+    context: str | None,
+    temperature: float,
+    session_id: str | None,
+) -> tuple[bytes | None, tuple | None]:
+    """
+    Return (exact key or None, early-turn key or None) for this request. Both
+    include the temperature, so a reply is only reused for a request sampled
+    the same way. The exact key also includes the session, so it never serves
+    one contributor's reply to another; without a session there is none.
+    """
+    early = None
+    if settings.enable_response_cache and context is None:
+        key = early_turn_key(history, user_message)
+        if key is not None:
+            early = (temperature, key)
+    exact = None
+    if session_id is not None:
+        exact = exact_key(history, user_message, context, temperature, session_id)
+    return exact, early
+
+
+def _cached_reply(keys: tuple[bytes | None, tuple | None]) -> str | None:
+    """Return a cached reply for this request, if there is one."""
+    exact, early = keys
+    reply = None if exact is None else _recent_replies.get(exact)
+    if reply is None and early is not None:
+        reply = _early_replies.get(early)
+    return reply
+
+
+def _remember_reply(keys: tuple[bytes | None, tuple | None], response_text: str) -> None:
+    """Cache a reply, unless it carries a SAVE_ITEM/UPDATE_ITEM tag that must never be replayed."""
+    if not response_text or "_ITEM>" in response_text.upper():
+        return
+    exact, early = keys
+    if exact is not None:
+        _recent_replies.put(exact, response_text)
+    if early is not None:
+        _early_replies.put(early, response_text)
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> OpenAI:
+    """
+    Return the shared sync client. Reusing it keeps the underlying httpx
+    connection pool (and its TLS sessions to openrouter.ai) alive across turns.
+    """
+    from openai import OpenAI
+
+    return OpenAI(**_client_options())
+
+
+# The async client's connection pool is bound to the event loop it was first
+# used on, so it is shared per loop rather than per process.
+_async_client: AsyncOpenAI | None = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_async_client() -> AsyncOpenAI:
+    """Return the async client for the running event loop (same reuse rationale as _get_client)."""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        from openai import AsyncOpenAI
+
+        _async_client = AsyncOpenAI(**_client_options())
+        _async_client_loop = loop
+    return _async_client
+
+
+# Per-request timeout for streamed replies, which stay open while the model writes
+_STREAM_TIMEOUT = 60.0
+
+
+def _fallback_errors() -> tuple[type[Exception], ...]:
+    """Errors (after the client's own retries) that are worth retrying on settings.fallback_model."""
+    from openai import APIConnectionError, RateLimitError
+
+    return (APIConnectionError, RateLimitError)
+
+
+def _create(**kwargs):
+    """Create a completion on settings.model, falling back to settings.fallback_model."""
+    client = _get_client()
+    try:
+        return client.chat.completions.create(model=settings.model, **kwargs)
+    except _fallback_errors() as exc:
+        if not settings.fallback_model:
+            raise
+        logger.warning("%s failed (%s); retrying on %s", settings.model, exc, settings.fallback_model)
+        return client.chat.completions.create(model=settings.fallback_model, **kwargs)
+
+
+async def _acreate(**kwargs):
+    """Async version of _create()."""
+    client = _get_async_client()
+    try:
+        return await client.chat.completions.create(model=settings.model, **kwargs)
+    except _fallback_errors() as exc:
+        if not settings.fallback_model:
+            raise
+        logger.warning("%s failed (%s); retrying on %s", settings.model, exc, settings.fallback_model)
+        return await client.chat.completions.create(model=settings.fallback_model, **kwargs)
+
+
+def chat(
+    history: list[dict],
+    user_message: str,
+    *,
+    context: str | None = None,
+    summary: HistorySummary | None = None,
+    temperature: float | None = None,
+    session_id: str | None = None,
+) -> tuple[str, list[dict]]:
     """
     Send a conversation turn to the LLM and return the response.
 
@@ -189,32 +673,161 @@ def chat(history: list[dict], user_message: str) -> tuple[str, list[dict]]:
     ----------
     history      : list of {"role": ..., "content": ...} messages (excludes the latest user turn)
     user_message : the user's latest message
+    context      : optional per-turn data for the model only (e.g. the current feed);
+                   sent after the history and left out of updated_history
+    summary      : optional HistorySummary from compress_history(); the messages it
+                   covers are sent as that summary instead of verbatim
+    temperature  : sampling temperature; by default chosen per turn by _pick_temperature()
+                   (top_p is sent only if settings.top_p is set)
+    session_id   : identifies the conversation; an exact repeat of a turn within
+                   the same session reuses the reply it already got
 
     Returns
     -------
     (response_text, updated_history)
     updated_history includes both the new user message and the assistant response.
+    A blank user_message gets a fixed reply without calling the LLM, and
+    updated_history is then just a copy of history.
     """
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=settings.openrouter_api_key,
-        default_headers={
-            "HTTP-Referer": "http://localhost",
-            "X-Title": settings.app_title,
-        },
-    )
+    turn = _prepare_turn(history, user_message, context, summary, temperature, session_id)
+    if turn.request is None:
+        return turn.reply, turn.updated_history
 
-    updated_history = list(history) + [{"role": "user", "content": user_message}]
+    response = _create(**turn.request)
 
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}] + updated_history
+    response_text = response.choices[0].message.content or ""
+    return response_text, _finish_turn(turn, response_text)
+
+
+async def achat(
+    history: list[dict],
+    user_message: str,
+    *,
+    context: str | None = None,
+    summary: HistorySummary | None = None,
+    temperature: float | None = None,
+    session_id: str | None = None,
+) -> tuple[str, list[dict]]:
+    """
+    Async version of chat(), for callers running on an event loop.
 
-    response = client.chat.completions.create(
-        model=settings.model,
-        messages=messages,
-        temperature=0.7,
-    )
+    Awaiting the request instead of blocking a thread lets concurrent
+    conversations overlap their round-trips to OpenRouter. Arguments and
+    return value are the same as chat().
+    """
+    turn = _prepare_turn(history, user_message, context, summary, temperature, session_id)
+    if turn.request is None:
+        return turn.reply, turn.updated_history
+
+    response = await _acreate(**turn.request)
 
     response_text = response.choices[0].message.content or ""
-    updated_history.append({"role": "assistant", "content": response_text})
+    return response_text, _finish_turn(turn, response_text)
+
+
+# Upper bound on concurrent requests from chat_batch()
+_BATCH_WORKERS = 8
+
 
-    return response_text, updated_history
+def chat_batch(
+    histories: list[list[dict]],
+    user_messages: list[str],
+) -> list[tuple[str, list[dict]]]:
+    """
+    Run several independent conversation turns at once, e.g. when seeding a
+    backlog of items. Returns one chat() result per input, in order.
+
+    Each turn is its own request, sent concurrently over the shared client;
+    the common system prompt prefix is what the provider's prompt cache
+    reuses, so there is no gain from packing them into one request.
+    """
+    if len(histories) != len(user_messages):
+        raise ValueError("histories and user_messages must be the same length")
+    if not histories:
+        return []
+    workers = min(_BATCH_WORKERS, len(histories))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(chat, histories, user_messages))
+
+
+async def achat_batch(
+    histories: list[list[dict]],
+    user_messages: list[str],
+) -> list[tuple[str, list[dict]]]:
+    """Async version of chat_batch()."""
+    if len(histories) != len(user_messages):
+        raise ValueError("histories and user_messages must be the same length")
+    return list(await asyncio.gather(*map(achat, histories, user_messages)))
+
+
+@dataclass
+class StreamResult:
+    """What chat_stream() returns once its chunks have all been yielded."""
+    full_text: str
+    updated_history: list[dict]
+
+
+def chat_stream(
+    history: list[dict],
+    user_message: str,
+    *,
+    context: str | None = None,
+    summary: HistorySummary | None = None,
+    temperature: float | None = None,
+    session_id: str | None = None,
+) -> Generator[str, None, StreamResult]:
+    """
+    Streaming counterpart to chat(): yield the response text as it arrives.
+
+    The generator's return value is a StreamResult holding the full reply and
+    the updated history, as chat() would return them. Get it with
+    `result = yield from chat_stream(...)`, or from StopIteration.value when
+    iterating by hand. Any <SAVE_ITEM> block is only complete in full_text,
+    so parse that rather than the chunks.
+    """
+    turn = _prepare_turn(history, user_message, context, summary, temperature, session_id)
+    if turn.request is None:
+        yield turn.reply
+        return StreamResult(turn.reply, turn.updated_history)
+
+    stream = _create(**turn.request, stream=True, timeout=_STREAM_TIMEOUT)
+    chunks = []
+    for chunk in stream:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                chunks.append(delta)
+                yield delta
+    response_text = "".join(chunks)
+    return StreamResult(response_text, _finish_turn(turn, response_text))
+
+
+async def achat_stream(
+    history: list[dict],
+    user_message: str,
+    *,
+    context: str | None = None,
+    summary: HistorySummary | None = None,
+    temperature: float | None = None,
+    session_id: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart to chat(): yield the response text as it arrives.
+
+    The caller is responsible for joining the chunks and recording the turn in
+    its own copy of the history.
+    """
+    turn = _prepare_turn(history, user_message, context, summary, temperature, session_id)
+    if turn.request is None:
+        yield turn.reply
+        return
+
+    stream = await _acreate(**turn.request, stream=True, timeout=_STREAM_TIMEOUT)
+    chunks = []
+    async for chunk in stream:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                chunks.append(delta)
+                yield delta
+    _finish_turn(turn, "".join(chunks))
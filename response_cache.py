@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+"""
+response_cache.py — In-process caches for LLM replies.
+
+Two kinds of key are provided:
+
+exact_key       the session, the whole conversation and the new message,
+                hashed. A resend of the same turn in the same session gets
+                the reply it already had, rather than a fresh (and, at
+                temperature 0.7, different) one. It never matches across
+                sessions.
+early_turn_key  opening turns only, shared across contributors (below).
+
+The opening turns of a conversation (giving a name, asking how the tool
+works) look much the same for every contributor, and they all start from
+the same hardcoded greeting. Caching those replies means a repeat of a
+question someone has already asked costs no LLM call.
+
+Matching is on normalised text (case, punctuation and spacing ignored;
+messages with a URL in them must match exactly), not on embeddings. That
+catches the common repeats ("How does this work?" and "how does this
+work") without pulling an embedding model and vector index into a small
+web app, and it never returns a reply meant for a different question.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+
+# Only conversations this short are cached: the greeting, plus at most the
+# contributor's first message and its reply. These are also the turns
+# llm._pick_temperature samples at low temperature; later turns depend on
+# the contributor's own material.
+EARLY_TURN_MAX_HISTORY = 2
+
+_PUNCT_RE = re.compile(r"[^\w\s]+")
+_SPACE_RE = re.compile(r"\s+")
+_URL_RE = re.compile(r"https?://|www\.", re.IGNORECASE)
+
+
+class ResponseCache:
+    """A small, thread-safe LRU mapping from a hashable key to a reply."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, str] = OrderedDict()
+        # llm.chat_batch() runs chat() on several threads at once
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> str | None:
+        """Return the cached reply for key, or None."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: str) -> None:
+        """Store a reply, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def normalise(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", text.lower())).strip()
+
+
+def early_turn_key(history: list[dict], user_message: str) -> tuple | None:
+    """
+    Return a cache key for an early turn, or None if the conversation is
+    already past the point where replies are shared between contributors.
+    A message containing a URL is matched exactly, since normalising would
+    merge different URLs (".../x-y" and ".../x.y") and the reply echoes them.
+    """
+    if len(history) > EARLY_TURN_MAX_HISTORY:
+        return None
+    message = user_message.strip() if _URL_RE.search(user_message) else normalise(user_message)
+    return (
+        tuple((m["role"], m["content"]) for m in history),
+        message,
+    )
+
+
+def exact_key(
+    history: list[dict],
+    user_message: str,
+    context: str | None = None,
+    temperature: float | None = None,
+    session_id: str | None = None,
+) -> bytes:
+    """
+    Return a 16-byte digest identifying this exact turn: session, history,
+    message, context and temperature.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(session_id).encode())
+    h.update(b"\1")
+    h.update(repr(temperature).encode())
+    h.update(b"\1")
+    for m in history:
+        h.update(m["role"].encode())
+        h.update(b"\0")
+        h.update(m["content"].encode())
+        h.update(b"\0")
+    h.update(b"\1")
+    h.update(user_message.encode())
+    if context is not None:
+        h.update(b"\1")
+        h.update(context.encode())
+    return h.digest()